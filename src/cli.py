@@ -5,12 +5,13 @@ Handles command-line argument parsing.
 """
 
 import argparse
+import functools
 import sys
 from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class SchedulerArgs:
     """Parsed command-line arguments."""
 
@@ -21,8 +22,9 @@ class SchedulerArgs:
     algorithm: str
 
 
-def parse_args(args: list[str] = None) -> SchedulerArgs:
-    """Parse and validate command-line arguments."""
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser once; repeated parse_args calls reuse it."""
     parser = argparse.ArgumentParser(
         description="Hippo Call Scheduler - Compute hourly agent staffing requirements"
     )
@@ -58,7 +60,12 @@ def parse_args(args: list[str] = None) -> SchedulerArgs:
         help="Scheduling algorithm: greedy (default) or shift (peak shaving + time-shifting)",
     )
 
-    parsed = parser.parse_args(args)
+    return parser
+
+
+def parse_args(args: list[str] = None) -> SchedulerArgs:
+    """Parse and validate command-line arguments."""
+    parsed = _build_parser().parse_args(args)
 
     # Validate utilization
     if parsed.utilization <= 0 or parsed.utilization > 1:
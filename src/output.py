@@ -3,46 +3,57 @@
 Output formatting, metrics, and file writing for Hippo Call Scheduler.
 """
 
+import io
 import json
 import os
 import sys
-from datetime import datetime
+import time
 
 from parser import CustomerRecord
 
+# "HH:00" labels for each hour of the day
+HOUR_LABELS = tuple(f"{hour:02d}:00" for hour in range(24))
+
+# Shared pretty-printing encoder; json.dumps(..., indent=2) builds a new one per call
+_JSON_ENCODER = json.JSONEncoder(indent=2)
+
+
+def _write_pairs(buf: io.StringIO, agents_by_name: dict[str, int], sep: str) -> None:
+    """Write name=agents pairs separated by sep into buf."""
+    first = True
+    for name, agents in agents_by_name.items():
+        if not first:
+            buf.write(sep)
+        buf.write(f"{name}={agents}")
+        first = False
+
 
 def format_text(allocations: list, show_unmet: bool = False) -> str:
     """Format allocations as text output."""
-    lines = []
-    for alloc in allocations:
-        hour_str = f"{alloc.hour:02d}:00"
+    buf = io.StringIO()
+    for i, alloc in enumerate(allocations):
+        if i:
+            buf.write("\n")
+        buf.write(f"{HOUR_LABELS[alloc.hour]} : total={alloc.total_agents} ; ")
 
         if alloc.customer_agents:
-            customers_str = ", ".join(
-                f"{name}={agents}" for name, agents in alloc.customer_agents.items()
-            )
+            _write_pairs(buf, alloc.customer_agents, ", ")
         else:
-            customers_str = "none"
-
-        line = f"{hour_str} : total={alloc.total_agents} ; {customers_str}"
+            buf.write("none")
 
         if show_unmet and alloc.unmet_demand:
-            unmet_str = ", ".join(
-                f"{name}={agents}" for name, agents in alloc.unmet_demand.items()
-            )
-            line += f" | unmet: {unmet_str}"
-
-        lines.append(line)
+            buf.write(" | unmet: ")
+            _write_pairs(buf, alloc.unmet_demand, ", ")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
-def format_json(allocations: list) -> str:
-    """Format allocations as JSON output."""
+def allocations_to_data(allocations: list) -> list[dict]:
+    """Convert allocations to the plain list/dict structure emitted as JSON."""
     data = []
     for alloc in allocations:
         entry = {
-            "hour": f"{alloc.hour:02d}:00",
+            "hour": HOUR_LABELS[alloc.hour],
             "total_agents": alloc.total_agents,
             "customers": alloc.customer_agents,
         }
@@ -50,22 +61,29 @@ def format_json(allocations: list) -> str:
             entry["unmet_demand"] = alloc.unmet_demand
         data.append(entry)
 
-    return json.dumps(data, indent=2)
+    return data
+
+
+def format_json(allocations: list) -> str:
+    """Format allocations as JSON output."""
+    return _JSON_ENCODER.encode(allocations_to_data(allocations))
 
 
 def format_csv_output(allocations: list) -> str:
     """Format allocations as CSV output."""
-    lines = ["hour,total_agents,customers,unmet_demand"]
+    buf = io.StringIO()
+    buf.write("hour,total_agents,customers,unmet_demand")
     for alloc in allocations:
-        customers_str = (
-            ";".join(f"{k}={v}" for k, v in alloc.customer_agents.items()) or "none"
-        )
-        unmet_str = ";".join(f"{k}={v}" for k, v in alloc.unmet_demand.items()) or ""
-        lines.append(
-            f'{alloc.hour:02d}:00,{alloc.total_agents},"{customers_str}","{unmet_str}"'
-        )
+        buf.write(f'\n{HOUR_LABELS[alloc.hour]},{alloc.total_agents},"')
+        if alloc.customer_agents:
+            _write_pairs(buf, alloc.customer_agents, ";")
+        else:
+            buf.write("none")
+        buf.write('","')
+        _write_pairs(buf, alloc.unmet_demand, ";")
+        buf.write('"')
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 def write_result_file(
@@ -84,7 +102,7 @@ def write_result_file(
     results_dir = "results"
     os.makedirs(results_dir, exist_ok=True)
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
 
     # Extract input file name without path and extension
     input_name = os.path.splitext(os.path.basename(input_path))[0]
@@ -104,8 +122,10 @@ def write_result_file(
     ext = extensions.get(format_type, "txt")
     filename = os.path.join(results_dir, f"{'_'.join(name_parts)}_RESULT.{ext}")
 
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(content)
+    # Content is already a complete string: encode once and hand it to the
+    # binary writer, which passes large payloads straight to write(2)
+    with open(filename, "wb") as f:
+        f.write(content.encode("utf-8"))
 
     return filename
 
@@ -117,19 +137,18 @@ def print_metrics(
     # Total calls ingested
     total_calls = sum(r.num_calls for r in records)
 
-    # Total agents for the day (sum of hourly totals)
-    total_agents_day = sum(a.total_agents for a in allocations)
-
-    # Peak agents (max in any hour)
-    peak_agents = max(a.total_agents for a in allocations) if allocations else 0
-
-    # Unmet demand analysis
-    unmet_by_hour: dict[int, dict[str, int]] = {}
+    # Single pass over allocations for agent-hours, peak agents and unmet demand
+    total_agents_day = 0
+    peak_agents = 0
+    unmet_by_hour: dict[int, tuple[int, dict[str, int]]] = {}
     total_unmet_agents = 0
     for alloc in allocations:
+        total_agents_day += alloc.total_agents
+        if alloc.total_agents > peak_agents:
+            peak_agents = alloc.total_agents
         if alloc.unmet_demand:
-            unmet_by_hour[alloc.hour] = alloc.unmet_demand
-            total_unmet_agents += sum(alloc.unmet_demand.values())
+            unmet_by_hour[alloc.hour] = (alloc.unmet_total, alloc.unmet_demand)
+            total_unmet_agents += alloc.unmet_total
 
     # Calculate actual calls conducted (estimate based on agent allocation ratio)
     total_agents_required = total_agents_day + total_unmet_agents
@@ -154,8 +173,7 @@ def print_metrics(
         print("-" * 50, file=sys.stderr)
         print("Unmet demand breakdown by hour:", file=sys.stderr)
         for hour in sorted(unmet_by_hour.keys()):
-            unmet = unmet_by_hour[hour]
-            hour_total = sum(unmet.values())
+            hour_total, unmet = unmet_by_hour[hour]
             customers_str = ", ".join(f"{name}={agents}" for name, agents in unmet.items())
             print(f"  {hour:02d}:00 : {hour_total:,} agents ({customers_str})", file=sys.stderr)
     else:
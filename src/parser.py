@@ -5,8 +5,12 @@ Handles parsing and validation of input CSV files.
 """
 
 import csv
+import io
+import operator
+import os
 import sys
 from dataclasses import dataclass
+from typing import TextIO
 
 
 class CSVColumns:
@@ -30,7 +34,7 @@ class CSVColumns:
     ]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CustomerRecord:
     """Validated customer call requirement."""
 
@@ -42,10 +46,21 @@ class CustomerRecord:
     priority: int  # 1-5, 1 is highest
 
 
+# Canonical time strings ("12AM" .. "11PM") mapped to hour (0-23)
+_TIME_TABLE = {
+    f"{(hour - 1) % 12 + 1}{'AM' if hour < 12 else 'PM'}": hour for hour in range(24)
+}
+
+
 def parse_time(time_str: str) -> int:
     """Parse time string like '9AM', '12PM', '7PM' to hour (0-23)."""
     time_str = time_str.strip().upper()
 
+    # Fast path for canonical strings; anything else is validated below
+    hour = _TIME_TABLE.get(time_str)
+    if hour is not None:
+        return hour
+
     # Handle edge cases
     if not time_str:
         raise ValueError("Empty time string")
@@ -81,86 +96,115 @@ def parse_time(time_str: str) -> int:
         return hour + 12
 
 
-def parse_csv(filepath: str) -> list[CustomerRecord]:
-    """Parse and validate input CSV file."""
+def parse_csv(source: str | os.PathLike[str] | TextIO) -> list[CustomerRecord]:
+    """Parse and validate input CSV from a file path or an open text stream."""
     records = []
+    # Row each customer name was first seen on; schedules are keyed by name
+    seen_names: dict[str, int] = {}
 
-    with open(filepath, "r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+    # Read the whole input in one call and parse from memory
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", newline="", encoding="utf-8") as f:
+            content = f.read()
+    else:
+        content = source.read()
+    reader = csv.reader(io.StringIO(content, newline=""))
+    header = next(reader, None)
+
+    # Validate required columns exist in header
+    if header is None:
+        print("Error: CSV file is empty or has no header row", file=sys.stderr)
+        sys.exit(1)
+
+    # Map stripped column names to positions once; later duplicates win,
+    # as they did with csv.DictReader
+    header = [col.strip() for col in header]
+    column_index = {col: i for i, col in enumerate(header)}
+    missing_headers = [col for col in CSVColumns.REQUIRED if col not in column_index]
+    if missing_headers:
+        print(
+            f"Error: CSV header is missing required column(s): {', '.join(missing_headers)}",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    # Fetches all required fields of a row, in CSVColumns.REQUIRED order, in one call
+    required_fields = operator.itemgetter(
+        *(column_index[col] for col in CSVColumns.REQUIRED)
+    )
+    num_columns = len(header)
+
+    # Blank lines are skipped and not counted, as with csv.DictReader
+    rows = (row for row in reader if row)
+    for row_num, row in enumerate(rows, start=2):  # Start at 2 (header is row 1)
+        try:
+            # Check for extra columns
+            if len(row) > num_columns:
+                raise ValueError(
+                    f"Row {row_num} has more columns than expected. Extra value(s): {row[num_columns:]}"
+                )
 
-        # Validate required columns exist in header
-        if reader.fieldnames is None:
-            print("Error: CSV file is empty or has no header row", file=sys.stderr)
-            sys.exit(1)
+            # Check for missing columns
+            if len(row) < num_columns:
+                raise ValueError(
+                    f"Row {row_num} is missing value(s) for column(s): {', '.join(header[len(row):])}"
+                )
 
-        header_cols = {col.strip() for col in reader.fieldnames if col}
-        missing_headers = [col for col in CSVColumns.REQUIRED if col not in header_cols]
-        if missing_headers:
-            print(
-                f"Error: CSV header is missing required column(s): {', '.join(missing_headers)}",
-                file=sys.stderr,
-            )
-            sys.exit(1)
+            # Parse fields (header was validated, so required columns are present)
+            (
+                name,
+                avg_duration_str,
+                start_time_str,
+                end_time_str,
+                num_calls_str,
+                priority_str,
+            ) = required_fields(row)
+
+            name = name.strip()
+            if not name:
+                raise ValueError(f"{CSVColumns.CUSTOMER_NAME} is required")
+            if name in seen_names:
+                raise ValueError(
+                    f"Duplicate {CSVColumns.CUSTOMER_NAME} '{name}' (first seen in row {seen_names[name]})"
+                )
+
+            avg_duration = int(avg_duration_str)
+            if avg_duration <= 0:
+                raise ValueError(f"{CSVColumns.AVG_CALL_DURATION_SECONDS} must be positive")
+
+            start_time_str = start_time_str.strip()
+            end_time_str = end_time_str.strip()
+            start_hour = parse_time(start_time_str)
+            end_hour = parse_time(end_time_str)
 
-        for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
-            try:
-                # Check for extra columns (None key indicates more values than headers)
-                if None in row:
-                    raise ValueError(
-                        f"Row {row_num} has more columns than expected. Extra value(s): {row[None]}"
-                    )
-
-                # Check for missing columns (None value indicates fewer values than headers)
-                missing_cols = [k for k, v in row.items() if v is None]
-                if missing_cols:
-                    raise ValueError(
-                        f"Row {row_num} is missing value(s) for column(s): {', '.join(missing_cols)}"
-                    )
-
-                # Strip whitespace from keys and values
-                row = {k.strip(): v.strip() for k, v in row.items()}
-
-                # Parse fields
-                name = row.get(CSVColumns.CUSTOMER_NAME, "")
-                if not name:
-                    raise ValueError(f"{CSVColumns.CUSTOMER_NAME} is required")
-
-                avg_duration = int(row.get(CSVColumns.AVG_CALL_DURATION_SECONDS, 0))
-                if avg_duration <= 0:
-                    raise ValueError(f"{CSVColumns.AVG_CALL_DURATION_SECONDS} must be positive")
-
-                start_time_str = row.get(CSVColumns.START_TIME_PT, "")
-                end_time_str = row.get(CSVColumns.END_TIME_PT, "")
-                start_hour = parse_time(start_time_str)
-                end_hour = parse_time(end_time_str)
-
-                # End time is exclusive, so 7PM means up to but not including 19:00
-                if end_hour <= start_hour:
-                    raise ValueError(
-                        f"{CSVColumns.END_TIME_PT} ({end_time_str}) must be after {CSVColumns.START_TIME_PT} ({start_time_str})"
-                    )
-
-                num_calls = int(row.get(CSVColumns.NUMBER_OF_CALLS, 0))
-                if num_calls < 0:
-                    raise ValueError(f"{CSVColumns.NUMBER_OF_CALLS} cannot be negative")
-
-                priority = int(row.get(CSVColumns.PRIORITY, 0))
-                if priority < 1 or priority > 5:
-                    raise ValueError(f"{CSVColumns.PRIORITY} must be 1-5, got: {priority}")
-
-                records.append(
-                    CustomerRecord(
-                        name=name,
-                        avg_duration_seconds=avg_duration,
-                        start_hour=start_hour,
-                        end_hour=end_hour,
-                        num_calls=num_calls,
-                        priority=priority,
-                    )
+            # End time is exclusive, so 7PM means up to but not including 19:00
+            if end_hour <= start_hour:
+                raise ValueError(
+                    f"{CSVColumns.END_TIME_PT} ({end_time_str}) must be after {CSVColumns.START_TIME_PT} ({start_time_str})"
                 )
 
-            except Exception as e:
-                print(f"Error parsing row {row_num}: {e}", file=sys.stderr)
-                sys.exit(1)
+            num_calls = int(num_calls_str)
+            if num_calls < 0:
+                raise ValueError(f"{CSVColumns.NUMBER_OF_CALLS} cannot be negative")
+
+            priority = int(priority_str)
+            if priority < 1 or priority > 5:
+                raise ValueError(f"{CSVColumns.PRIORITY} must be 1-5, got: {priority}")
+
+            seen_names[name] = row_num
+            records.append(
+                CustomerRecord(
+                    name=name,
+                    avg_duration_seconds=avg_duration,
+                    start_hour=start_hour,
+                    end_hour=end_hour,
+                    num_calls=num_calls,
+                    priority=priority,
+                )
+            )
+
+        except Exception as e:
+            print(f"Error parsing row {row_num}: {e}", file=sys.stderr)
+            sys.exit(1)
 
     return records
@@ -7,7 +7,7 @@ Computes hour-by-hour agent requirements based on customer call demands.
 
 import math
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from parser import CustomerRecord, parse_csv
 
 from cli import parse_args
@@ -20,7 +20,7 @@ from output import (
 )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class HourlyAllocation:
     """Agent allocation for a single hour."""
 
@@ -30,21 +30,34 @@ class HourlyAllocation:
     unmet_demand: dict[
         str, int
     ]  # customer_name -> unmet agents (when capacity-constrained)
+    unmet_total: int = field(init=False)  # sum of unmet_demand values
+
+    def __post_init__(self) -> None:
+        # Computed from unmet_demand when the allocation is built; frozen only
+        # blocks rebinding fields, so mutating that dict afterwards leaves this stale
+        object.__setattr__(self, "unmet_total", sum(self.unmet_demand.values()))
+
+
+def _agents_in_window(record: CustomerRecord, utilization: float) -> int:
+    """Calculate the constant agents needed in each active hour of a customer."""
+    active_hours = record.end_hour - record.start_hour
+    if active_hours <= 0:
+        return 0
+
+    calls_per_hour = record.num_calls / active_hours
+    # Kept in floating point on purpose: exact integer ceil-division disagrees
+    # with this formula on rare inputs, which would change published schedules
+    return math.ceil(calls_per_hour * record.avg_duration_seconds / 3600 / utilization)
 
 
 def calculate_agents_per_hour(
     record: CustomerRecord, utilization: float
 ) -> dict[int, int]:
     """Calculate agents needed per hour for a customer."""
-    active_hours = record.end_hour - record.start_hour
-    if active_hours <= 0:
+    if record.end_hour <= record.start_hour:
         return {}
 
-    calls_per_hour = record.num_calls / active_hours
-    agents_per_hour = math.ceil(
-        calls_per_hour * record.avg_duration_seconds / 3600 / utilization
-    )
-
+    agents_per_hour = _agents_in_window(record, utilization)
     return {hour: agents_per_hour for hour in range(record.start_hour, record.end_hour)}
 
 
@@ -52,23 +65,26 @@ def schedule_unconstrained(
     records: list[CustomerRecord], utilization: float
 ) -> list[HourlyAllocation]:
     """Schedule without capacity constraints - just sum up all requirements."""
-    # Calculate agents per hour for each customer
-    customer_hourly = {}
-    for record in records:
-        customer_hourly[record.name] = calculate_agents_per_hour(record, utilization)
+    # Agents are uniform across a customer's window, so compute each once
+    # as (name, start_hour, end_hour, agents) instead of a per-hour dict
+    windows = [
+        (r.name, r.start_hour, r.end_hour, _agents_in_window(r, utilization))
+        for r in records
+    ]
 
     # Build hourly allocations
     allocations = []
     for hour in range(24):
         customer_agents = {}
-        for record in records:
-            agents = customer_hourly[record.name].get(hour, 0)
-            if agents > 0:
-                customer_agents[record.name] = agents
+        for name, start_hour, end_hour, agents in windows:
+            if start_hour <= hour < end_hour and agents > 0:
+                customer_agents[name] = agents
 
         allocations.append(
             HourlyAllocation(
                 hour=hour,
+                # Summed from the breakdown so the total always matches it,
+                # even if a caller passes records sharing a name
                 total_agents=sum(customer_agents.values()),
                 customer_agents=customer_agents,
                 unmet_demand={},
@@ -82,13 +98,12 @@ def schedule_with_capacity(
     records: list[CustomerRecord], utilization: float, capacity: int
 ) -> list[HourlyAllocation]:
     """Schedule with capacity constraint using priority-based greedy allocation."""
-    # Calculate required agents per hour for each customer
-    customer_hourly = {}
-    for record in records:
-        customer_hourly[record.name] = calculate_agents_per_hour(record, utilization)
-
-    # Sort records by priority (1 = highest priority = first)
-    sorted_records = sorted(records, key=lambda r: r.priority)
+    # Calculate required agents per hour for each customer, as
+    # (name, start_hour, end_hour, agents) sorted by priority (1 = highest = first)
+    sorted_windows = [
+        (r.name, r.start_hour, r.end_hour, _agents_in_window(r, utilization))
+        for r in sorted(records, key=lambda r: r.priority)
+    ]
 
     # Build hourly allocations with capacity constraint
     allocations = []
@@ -97,20 +112,21 @@ def schedule_with_capacity(
         customer_agents = {}
         unmet_demand = {}
 
-        for record in sorted_records:
-            required = customer_hourly[record.name].get(hour, 0)
-            if required > 0:
+        for name, start_hour, end_hour, required in sorted_windows:
+            if start_hour <= hour < end_hour and required > 0:
                 allocated = min(required, remaining_capacity)
                 if allocated > 0:
-                    customer_agents[record.name] = allocated
+                    customer_agents[name] = allocated
                     remaining_capacity -= allocated
 
                 if required > allocated:
-                    unmet_demand[record.name] = required - allocated
+                    unmet_demand[name] = required - allocated
 
         allocations.append(
             HourlyAllocation(
                 hour=hour,
+                # Summed from the breakdown rather than consumed capacity, which
+                # overcounts when records share a name
                 total_agents=sum(customer_agents.values()),
                 customer_agents=customer_agents,
                 unmet_demand=unmet_demand,
@@ -120,7 +136,7 @@ def schedule_with_capacity(
     return allocations
 
 
-@dataclass
+@dataclass(slots=True)
 class CustomerHourlyDemand:
     """Track per-hour call/agent distribution for a customer."""
 
@@ -128,14 +144,13 @@ class CustomerHourlyDemand:
     priority: int
     start_hour: int
     end_hour: int
-    original_calls: dict[
-        int, float
-    ]  # hour -> calls (can be fractional during redistribution)
-    current_calls: dict[int, float]  # hour -> calls after redistribution
+    # Calls per hour as 24 slots indexed by hour (0.0 outside the active window)
+    original_calls: list[float]  # can be fractional during redistribution
+    current_calls: list[float]  # calls after redistribution
     agents_per_call: float  # avg_duration_seconds / 3600 / utilization
 
 
-@dataclass
+@dataclass(slots=True)
 class RedistributionSummary:
     """Track moves made during optimization."""
 
@@ -158,9 +173,9 @@ def build_customer_demands(
         calls_per_hour = record.num_calls / active_hours
         agents_per_call = record.avg_duration_seconds / 3600 / utilization
 
-        hourly_calls = {
-            hour: calls_per_hour for hour in range(record.start_hour, record.end_hour)
-        }
+        hourly_calls = [0.0] * 24
+        for hour in range(record.start_hour, record.end_hour):
+            hourly_calls[hour] = calls_per_hour
 
         demands.append(
             CustomerHourlyDemand(
@@ -179,16 +194,17 @@ def build_customer_demands(
 
 def get_agents_needed(demand: CustomerHourlyDemand, hour: int) -> int:
     """Calculate agents needed for a customer at a specific hour."""
-    calls = demand.current_calls.get(hour, 0)
-    return math.ceil(calls * demand.agents_per_call)
+    # Calls become fractional during redistribution, so this stays a float ceil
+    return math.ceil(demand.current_calls[hour] * demand.agents_per_call)
 
 
-def get_total_agents_per_hour(demands: list[CustomerHourlyDemand]) -> dict[int, int]:
+def get_total_agents_per_hour(demands: list[CustomerHourlyDemand]) -> list[int]:
     """Calculate total agents needed per hour across all customers."""
-    totals = {}
-    for hour in range(24):
-        total = sum(get_agents_needed(d, hour) for d in demands)
-        totals[hour] = total
+    totals = [0] * 24
+    for d in demands:
+        # Only hours inside the customer's window can carry calls
+        for hour in range(d.start_hour, d.end_hour):
+            totals[hour] += get_agents_needed(d, hour)
     return totals
 
 
@@ -204,9 +220,14 @@ def apply_redistribution(
     Only affects overflowed customers; higher-priority distributions unchanged.
     """
     redistributions = []
+    ceil = math.ceil
+
+    # Running per-hour totals, kept in sync on every move so overflow and
+    # spillover checks do not rescan all demands
+    hour_totals = get_total_agents_per_hour(demands)
 
     for hour in range(24):
-        total_agents = sum(get_agents_needed(d, hour) for d in demands)
+        total_agents = hour_totals[hour]
         if total_agents <= capacity:
             continue
 
@@ -218,25 +239,30 @@ def apply_redistribution(
             if overflow <= 0:
                 break
 
-            current_calls = demand.current_calls.get(hour, 0)
+            # Bind per-demand values once; the move loop below is the hot path
+            calls = demand.current_calls
+            agents_per_call = demand.agents_per_call
+
+            current_calls = calls[hour]
             if current_calls <= 0:
                 continue
 
-            current_agents = get_agents_needed(demand, hour)
+            current_agents = ceil(current_calls * agents_per_call)
             if current_agents <= 0:
                 continue
 
             # Find spillover candidates: hours within customer's window with available capacity
-            spillover_hours = get_spillover_candidates(demand, hour, demands, capacity)
+            spillover_hours = get_spillover_candidates(
+                demand, hour, hour_totals, capacity
+            )
+
+            calls_per_agent = 1 / agents_per_call if agents_per_call > 0 else 0
 
             for target_hour, available_capacity in spillover_hours:
                 if overflow <= 0 or current_calls <= 0:
                     break
 
                 # Calculate how many calls we can move
-                calls_per_agent = (
-                    1 / demand.agents_per_call if demand.agents_per_call > 0 else 0
-                )
                 # Limit by: source calls, target capacity, AND overflow needed
                 calls_to_resolve_overflow = overflow * calls_per_agent
                 max_calls_to_move = min(
@@ -246,16 +272,21 @@ def apply_redistribution(
                 )
 
                 if max_calls_to_move > 0:
+                    target_agents_before = ceil(calls[target_hour] * agents_per_call)
+
                     # Move calls
-                    demand.current_calls[hour] = (
-                        demand.current_calls.get(hour, 0) - max_calls_to_move
-                    )
-                    demand.current_calls[target_hour] = (
-                        demand.current_calls.get(target_hour, 0) + max_calls_to_move
-                    )
+                    calls[hour] -= max_calls_to_move
+                    calls[target_hour] += max_calls_to_move
                     current_calls -= max_calls_to_move
 
-                    agents_freed = math.ceil(max_calls_to_move * demand.agents_per_call)
+                    source_agents = ceil(calls[hour] * agents_per_call)
+                    hour_totals[hour] += source_agents - current_agents
+                    current_agents = source_agents
+                    hour_totals[target_hour] += (
+                        ceil(calls[target_hour] * agents_per_call) - target_agents_before
+                    )
+
+                    agents_freed = ceil(max_calls_to_move * agents_per_call)
                     overflow -= agents_freed
 
                     redistributions.append(
@@ -273,32 +304,29 @@ def apply_redistribution(
 def get_spillover_candidates(
     demand: CustomerHourlyDemand,
     source_hour: int,
-    all_demands: list[CustomerHourlyDemand],
+    hour_totals: list[int],
     capacity: int,
 ) -> list[tuple[int, int]]:
     """
     Find valid target hours for redistribution, sorted by proximity to source hour.
 
+    hour_totals holds the current total agents per hour across all customers.
     Returns list of (hour, available_capacity) tuples.
     """
     candidates = []
+    start_hour, end_hour = demand.start_hour, demand.end_hour
 
-    for target_hour in range(demand.start_hour, demand.end_hour):
-        if target_hour == source_hour:
-            continue
-
-        # Calculate current usage at target hour
-        total_at_target = sum(get_agents_needed(d, target_hour) for d in all_demands)
-        available = capacity - total_at_target
+    # Walk outwards from the source hour so candidates come out already
+    # ordered by distance (earlier hour first on ties)
+    max_distance = max(source_hour - start_hour, end_hour - 1 - source_hour)
+    for distance in range(1, max_distance + 1):
+        for target_hour in (source_hour - distance, source_hour + distance):
+            if start_hour <= target_hour < end_hour:
+                available = capacity - hour_totals[target_hour]
+                if available > 0:
+                    candidates.append((target_hour, available))
 
-        if available > 0:
-            distance = abs(target_hour - source_hour)
-            candidates.append((target_hour, available, distance))
-
-    # Sort by distance (prefer closer hours)
-    candidates.sort(key=lambda x: x[2])
-
-    return [(h, avail) for h, avail, _ in candidates]
+    return candidates
 
 
 def schedule_with_capacity_shift(
@@ -326,9 +354,13 @@ def schedule_with_capacity_shift(
         customer_agents = {}
         unmet_demand = {}
 
-        # Allocate by priority
+        # Allocate by priority; calls never leave a customer's window, so
+        # only demands active at this hour can need agents
         for demand in sorted_by_priority:
-            required = get_agents_needed(demand, hour)
+            if not demand.start_hour <= hour < demand.end_hour:
+                continue
+
+            required = math.ceil(demand.current_calls[hour] * demand.agents_per_call)
             if required > 0:
                 allocated = min(required, remaining_capacity)
                 if allocated > 0:
@@ -341,6 +373,8 @@ def schedule_with_capacity_shift(
         allocations.append(
             HourlyAllocation(
                 hour=hour,
+                # Summed from the breakdown rather than consumed capacity, which
+                # overcounts when records share a name
                 total_agents=sum(customer_agents.values()),
                 customer_agents=customer_agents,
                 unmet_demand=unmet_demand,
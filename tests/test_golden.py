@@ -7,10 +7,12 @@ These tests verify:
 3. All scheduling modes work correctly (unconstrained, greedy, shift)
 """
 
+import functools
 import json
 import os
 import sys
 import unittest
+from pathlib import Path
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
@@ -23,33 +25,62 @@ from scheduler import (
     schedule_with_capacity_shift,
 )
 
-from output import format_json
+from output import allocations_to_data, format_json
 
 
 # Path to test fixtures
 GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
 INPUT_CSV = os.path.join(os.path.dirname(__file__), "..", "input", "input.csv")
 
+# Expected hour labels, 00:00 through 23:00
+EXPECTED_HOURS = tuple(f"{i:02d}:00" for i in range(24))
 
-def allocations_to_json_data(allocations):
-    """Convert allocations to JSON-serializable data structure."""
-    return json.loads(format_json(allocations))
+
+@functools.lru_cache(maxsize=None)
+def sample_records():
+    """Parse the sample CSV once per module; records are frozen."""
+    return parse_csv(INPUT_CSV)
+
+
+@functools.lru_cache(maxsize=None)
+def unconstrained_allocations():
+    """Unconstrained schedule for the sample CSV, shared across tests."""
+    return schedule_unconstrained(sample_records(), utilization=1.0)
+
+
+@functools.lru_cache(maxsize=None)
+def greedy_allocations(capacity):
+    """Greedy capacity schedule for the sample CSV, shared across tests."""
+    return schedule_with_capacity(sample_records(), utilization=1.0, capacity=capacity)
+
+
+@functools.lru_cache(maxsize=None)
+def shift_schedule(capacity):
+    """Shift schedule (allocations, redistributions) for the sample CSV, shared across tests."""
+    return schedule_with_capacity_shift(
+        sample_records(), utilization=1.0, capacity=capacity
+    )
+
+
+def load_golden(filename):
+    """Load a committed golden JSON fixture."""
+    # json.loads accepts UTF-8 bytes directly, skipping the text-mode codec
+    return json.loads(Path(GOLDEN_DIR, filename).read_bytes())
 
 
 class TestGoldenUnconstrained(unittest.TestCase):
     """Golden tests for unconstrained scheduling."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Load the golden file and convert the shared schedule to plain data."""
+        cls.golden = load_golden("unconstrained.json")
+        cls.data = allocations_to_data(unconstrained_allocations())
+
     def test_matches_golden_file(self):
         """Test that unconstrained output matches golden file."""
-        # Load golden file
-        golden_path = os.path.join(GOLDEN_DIR, "unconstrained.json")
-        with open(golden_path, "r") as f:
-            expected = json.load(f)
-
-        # Run scheduler
-        records = parse_csv(INPUT_CSV)
-        allocations = schedule_unconstrained(records, utilization=1.0)
-        actual = allocations_to_json_data(allocations)
+        expected = self.golden
+        actual = self.data
 
         # Compare
         self.assertEqual(
@@ -60,15 +91,12 @@ class TestGoldenUnconstrained(unittest.TestCase):
 
     def test_idempotent(self):
         """Test that running twice yields identical results."""
-        records = parse_csv(INPUT_CSV)
-
-        # First run
-        allocations1 = schedule_unconstrained(records, utilization=1.0)
-        result1 = allocations_to_json_data(allocations1)
+        # First run (shared from setUpClass)
+        result1 = self.data
 
         # Second run
-        allocations2 = schedule_unconstrained(records, utilization=1.0)
-        result2 = allocations_to_json_data(allocations2)
+        allocations2 = schedule_unconstrained(sample_records(), utilization=1.0)
+        result2 = allocations_to_data(allocations2)
 
         self.assertEqual(
             result1,
@@ -76,21 +104,21 @@ class TestGoldenUnconstrained(unittest.TestCase):
             "Unconstrained scheduling is not idempotent",
         )
 
+    def test_format_json_round_trips(self):
+        """Test that format_json output parses back to the plain data structure."""
+        self.assertEqual(
+            json.loads(format_json(unconstrained_allocations())),
+            self.data,
+        )
+
     def test_exactly_24_hours(self):
         """Test that output has exactly 24 hours."""
-        records = parse_csv(INPUT_CSV)
-        allocations = schedule_unconstrained(records, utilization=1.0)
-
-        self.assertEqual(len(allocations), 24)
+        self.assertEqual(len(unconstrained_allocations()), 24)
 
     def test_hours_in_order(self):
         """Test that hours are in order 00:00 to 23:00."""
-        records = parse_csv(INPUT_CSV)
-        allocations = schedule_unconstrained(records, utilization=1.0)
-        result = allocations_to_json_data(allocations)
-
-        for i, entry in enumerate(result):
-            expected_hour = f"{i:02d}:00"
+        for i, entry in enumerate(self.data):
+            expected_hour = EXPECTED_HOURS[i]
             self.assertEqual(
                 entry["hour"],
                 expected_hour,
@@ -101,17 +129,16 @@ class TestGoldenUnconstrained(unittest.TestCase):
 class TestGoldenCapacityGreedy(unittest.TestCase):
     """Golden tests for capacity-constrained greedy scheduling."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Load the golden file and convert the shared schedule to plain data."""
+        cls.golden = load_golden("capacity_1500_greedy.json")
+        cls.data = allocations_to_data(greedy_allocations(1500))
+
     def test_matches_golden_file(self):
         """Test that greedy capacity output matches golden file."""
-        # Load golden file
-        golden_path = os.path.join(GOLDEN_DIR, "capacity_1500_greedy.json")
-        with open(golden_path, "r") as f:
-            expected = json.load(f)
-
-        # Run scheduler
-        records = parse_csv(INPUT_CSV)
-        allocations = schedule_with_capacity(records, utilization=1.0, capacity=1500)
-        actual = allocations_to_json_data(allocations)
+        expected = self.golden
+        actual = self.data
 
         # Compare
         self.assertEqual(
@@ -122,15 +149,14 @@ class TestGoldenCapacityGreedy(unittest.TestCase):
 
     def test_idempotent(self):
         """Test that running twice yields identical results."""
-        records = parse_csv(INPUT_CSV)
-
-        # First run
-        allocations1 = schedule_with_capacity(records, utilization=1.0, capacity=1500)
-        result1 = allocations_to_json_data(allocations1)
+        # First run (shared from setUpClass)
+        result1 = self.data
 
         # Second run
-        allocations2 = schedule_with_capacity(records, utilization=1.0, capacity=1500)
-        result2 = allocations_to_json_data(allocations2)
+        allocations2 = schedule_with_capacity(
+            sample_records(), utilization=1.0, capacity=1500
+        )
+        result2 = allocations_to_data(allocations2)
 
         self.assertEqual(
             result1,
@@ -140,10 +166,7 @@ class TestGoldenCapacityGreedy(unittest.TestCase):
 
     def test_capacity_not_exceeded(self):
         """Test that capacity is never exceeded."""
-        records = parse_csv(INPUT_CSV)
-        allocations = schedule_with_capacity(records, utilization=1.0, capacity=1500)
-
-        for alloc in allocations:
+        for alloc in greedy_allocations(1500):
             self.assertLessEqual(
                 alloc.total_agents,
                 1500,
@@ -152,30 +175,28 @@ class TestGoldenCapacityGreedy(unittest.TestCase):
 
     def test_has_unmet_demand(self):
         """Test that unmet demand is tracked when capacity is insufficient."""
-        records = parse_csv(INPUT_CSV)
-        allocations = schedule_with_capacity(records, utilization=1.0, capacity=1500)
-
         # With capacity 1500, peak hour 11 (2059 unconstrained) should have unmet demand
-        has_unmet = any(alloc.unmet_demand for alloc in allocations)
-        self.assertTrue(has_unmet, "Should have unmet demand with capacity 1500")
+        self.assertGreater(
+            greedy_allocations(1500)[11].unmet_total,
+            0,
+            "Should have unmet demand with capacity 1500",
+        )
 
 
 class TestGoldenCapacityShift(unittest.TestCase):
     """Golden tests for capacity-constrained shift scheduling."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Load the golden file and convert the shared schedule to plain data."""
+        cls.golden = load_golden("capacity_1500_shift.json")
+        allocations, _ = shift_schedule(1500)
+        cls.data = allocations_to_data(allocations)
+
     def test_matches_golden_file(self):
         """Test that shift capacity output matches golden file."""
-        # Load golden file
-        golden_path = os.path.join(GOLDEN_DIR, "capacity_1500_shift.json")
-        with open(golden_path, "r") as f:
-            expected = json.load(f)
-
-        # Run scheduler
-        records = parse_csv(INPUT_CSV)
-        allocations, _ = schedule_with_capacity_shift(
-            records, utilization=1.0, capacity=1500
-        )
-        actual = allocations_to_json_data(allocations)
+        expected = self.golden
+        actual = self.data
 
         # Compare
         self.assertEqual(
@@ -186,20 +207,15 @@ class TestGoldenCapacityShift(unittest.TestCase):
 
     def test_idempotent(self):
         """Test that running twice yields identical results."""
-        records = parse_csv(INPUT_CSV)
+        # First run (shared from setUpClass)
+        result1 = self.data
+        _, redist1 = shift_schedule(1500)
 
-        # First run
-        allocations1, redist1 = schedule_with_capacity_shift(
-            records, utilization=1.0, capacity=1500
-        )
-        result1 = allocations_to_json_data(allocations1)
-
-        # Second run (need to re-parse to get fresh records)
-        records2 = parse_csv(INPUT_CSV)
+        # Second run
         allocations2, redist2 = schedule_with_capacity_shift(
-            records2, utilization=1.0, capacity=1500
+            sample_records(), utilization=1.0, capacity=1500
         )
-        result2 = allocations_to_json_data(allocations2)
+        result2 = allocations_to_data(allocations2)
 
         self.assertEqual(
             result1,
@@ -216,11 +232,7 @@ class TestGoldenCapacityShift(unittest.TestCase):
 
     def test_capacity_not_exceeded(self):
         """Test that capacity is never exceeded."""
-        records = parse_csv(INPUT_CSV)
-        allocations, _ = schedule_with_capacity_shift(
-            records, utilization=1.0, capacity=1500
-        )
-
+        allocations, _ = shift_schedule(1500)
         for alloc in allocations:
             self.assertLessEqual(
                 alloc.total_agents,
@@ -230,42 +242,28 @@ class TestGoldenCapacityShift(unittest.TestCase):
 
     def test_redistributions_occurred(self):
         """Test that redistributions occurred to optimize capacity usage."""
-        records = parse_csv(INPUT_CSV)
-        allocations, redistributions = schedule_with_capacity_shift(
-            records, utilization=1.0, capacity=1500
-        )
-
         # With capacity 1500 and peak of 2059, redistributions should occur
         self.assertGreater(
-            len(redistributions),
+            len(shift_schedule(1500)[1]),
             0,
             "Should have redistributions with capacity 1500",
         )
 
     def test_shift_reduces_unmet_demand_vs_greedy(self):
         """Test that shift algorithm reduces unmet demand compared to greedy."""
-        records = parse_csv(INPUT_CSV)
-
         # Greedy
-        greedy_allocs = schedule_with_capacity(records, utilization=1.0, capacity=1500)
-        greedy_unmet = sum(
-            sum(a.unmet_demand.values()) for a in greedy_allocs if a.unmet_demand
-        )
+        greedy_allocs = greedy_allocations(1500)
+        greedy_unmet = sum(a.unmet_total for a in greedy_allocs)
 
-        # Shift (need fresh records since shift mutates demands)
-        records2 = parse_csv(INPUT_CSV)
-        shift_allocs, _ = schedule_with_capacity_shift(
-            records2, utilization=1.0, capacity=1500
-        )
-        shift_unmet = sum(
-            sum(a.unmet_demand.values()) for a in shift_allocs if a.unmet_demand
-        )
+        # Shift
+        shift_allocs, _ = shift_schedule(1500)
+        shift_unmet = sum(a.unmet_total for a in shift_allocs)
 
         # Shift should have less or equal unmet demand
         self.assertLessEqual(
             shift_unmet,
             greedy_unmet,
-            f"Shift should reduce unmet demand: shift={shift_unmet}, greedy={greedy_unmet}",
+            "Shift should reduce unmet demand",
         )
 
 
@@ -274,14 +272,10 @@ class TestGoldenCrossValidation(unittest.TestCase):
 
     def test_unconstrained_equals_greedy_with_infinite_capacity(self):
         """Test that unconstrained equals greedy with very high capacity."""
-        records = parse_csv(INPUT_CSV)
-
-        unconstrained = schedule_unconstrained(records, utilization=1.0)
-        unconstrained_json = allocations_to_json_data(unconstrained)
+        unconstrained_json = allocations_to_data(unconstrained_allocations())
 
         # With capacity higher than peak (2059), greedy should match unconstrained
-        greedy = schedule_with_capacity(records, utilization=1.0, capacity=10000)
-        greedy_json = allocations_to_json_data(greedy)
+        greedy_json = allocations_to_data(greedy_allocations(10000))
 
         # Compare total_agents and customers (ignore unmet_demand key)
         for u, g in zip(unconstrained_json, greedy_json):
@@ -290,18 +284,19 @@ class TestGoldenCrossValidation(unittest.TestCase):
 
     def test_all_modes_have_24_hours(self):
         """Test that all scheduling modes produce exactly 24 hours."""
-        records = parse_csv(INPUT_CSV)
-
-        unconstrained = schedule_unconstrained(records, utilization=1.0)
-        self.assertEqual(len(unconstrained), 24)
-
-        greedy = schedule_with_capacity(records, utilization=1.0, capacity=1500)
-        self.assertEqual(len(greedy), 24)
-
-        records2 = parse_csv(INPUT_CSV)
-        shift, _ = schedule_with_capacity_shift(records2, utilization=1.0, capacity=1500)
+        shift, _ = shift_schedule(1500)
+        self.assertEqual(len(unconstrained_allocations()), 24)
+        self.assertEqual(len(greedy_allocations(1500)), 24)
         self.assertEqual(len(shift), 24)
 
+    def test_unmet_total_matches_unmet_demand(self):
+        """Test that each hour's unmet_total equals the sum of its unmet_demand."""
+        shift, _ = shift_schedule(1500)
+        for mode, allocations in (("greedy", greedy_allocations(1500)), ("shift", shift)):
+            for alloc in allocations:
+                with self.subTest(mode=mode, hour=alloc.hour):
+                    self.assertEqual(alloc.unmet_total, sum(alloc.unmet_demand.values()))
+
 
 if __name__ == "__main__":
     unittest.main()
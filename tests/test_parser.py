@@ -2,140 +2,119 @@
 Unit tests for CSV parsing and time parsing.
 """
 
+import contextlib
+import io
 import os
 import sys
 import tempfile
 import unittest
+from pathlib import Path
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from parser import CustomerRecord, parse_time, parse_csv
 
+CSV_HEADER = (
+    "CustomerName,AverageCallDurationSeconds,StartTimePT,EndTimePT,NumberOfCalls,Priority"
+)
+
+
+# (input, expected hour) pairs accepted by parse_time
+VALID_TIME_CASES = [
+    # Basic AM times
+    ("1AM", 1),
+    ("6AM", 6),
+    ("9AM", 9),
+    ("11AM", 11),
+    # Basic PM times
+    ("1PM", 13),
+    ("3PM", 15),
+    ("7PM", 19),
+    ("11PM", 23),
+    # 12AM is midnight, 12PM is noon
+    ("12AM", 0),
+    ("12PM", 12),
+    # Lowercase and mixed case
+    ("9am", 9),
+    ("7pm", 19),
+    ("9Am", 9),
+    ("7Pm", 19),
+    # Surrounding whitespace is stripped
+    (" 9AM ", 9),
+    ("  7PM  ", 19),
+    # Zero-padded hours outside the canonical form
+    ("09AM", 9),
+    ("07PM", 19),
+]
+
+# (input, expected error fragment) pairs rejected by parse_time
+INVALID_TIME_CASES = [
+    ("", "Empty time string"),
+    ("9", "Invalid time format"),
+    ("13AM", "Hour must be 1-12"),
+    ("0AM", "Hour must be 1-12"),
+    ("XYZAM", "Invalid hour"),
+]
+
 
 class TestParseTime(unittest.TestCase):
     """Unit tests for parse_time function."""
 
-    def test_basic_am_times(self):
-        """Test basic AM time parsing."""
-        self.assertEqual(parse_time("1AM"), 1)
-        self.assertEqual(parse_time("6AM"), 6)
-        self.assertEqual(parse_time("9AM"), 9)
-        self.assertEqual(parse_time("11AM"), 11)
-
-    def test_basic_pm_times(self):
-        """Test basic PM time parsing."""
-        self.assertEqual(parse_time("1PM"), 13)
-        self.assertEqual(parse_time("3PM"), 15)
-        self.assertEqual(parse_time("7PM"), 19)
-        self.assertEqual(parse_time("11PM"), 23)
-
-    def test_12am_midnight(self):
-        """Test 12AM (midnight) edge case."""
-        self.assertEqual(parse_time("12AM"), 0)
-
-    def test_12pm_noon(self):
-        """Test 12PM (noon) edge case."""
-        self.assertEqual(parse_time("12PM"), 12)
-
-    def test_lowercase_input(self):
-        """Test that lowercase input is handled."""
-        self.assertEqual(parse_time("9am"), 9)
-        self.assertEqual(parse_time("7pm"), 19)
-
-    def test_mixed_case_input(self):
-        """Test that mixed case input is handled."""
-        self.assertEqual(parse_time("9Am"), 9)
-        self.assertEqual(parse_time("7Pm"), 19)
-
-    def test_whitespace_handling(self):
-        """Test that whitespace is stripped."""
-        self.assertEqual(parse_time(" 9AM "), 9)
-        self.assertEqual(parse_time("  7PM  "), 19)
-
-    def test_empty_string_raises(self):
-        """Test that empty string raises ValueError."""
-        with self.assertRaises(ValueError) as context:
-            parse_time("")
-        self.assertIn("Empty time string", str(context.exception))
-
-    def test_missing_am_pm_raises(self):
-        """Test that missing AM/PM raises ValueError."""
-        with self.assertRaises(ValueError) as context:
-            parse_time("9")
-        self.assertIn("Invalid time format", str(context.exception))
-
-    def test_invalid_hour_raises(self):
-        """Test that invalid hour (>12) raises ValueError."""
-        with self.assertRaises(ValueError) as context:
-            parse_time("13AM")
-        self.assertIn("Hour must be 1-12", str(context.exception))
-
-    def test_zero_hour_raises(self):
-        """Test that 0AM/0PM raises ValueError."""
-        with self.assertRaises(ValueError) as context:
-            parse_time("0AM")
-        self.assertIn("Hour must be 1-12", str(context.exception))
-
-    def test_non_numeric_hour_raises(self):
-        """Test that non-numeric hour raises ValueError."""
-        with self.assertRaises(ValueError) as context:
-            parse_time("XYZAM")
-        self.assertIn("Invalid hour", str(context.exception))
+    def test_valid_times(self):
+        """Test that valid time strings parse to the expected hour."""
+        for time_str, expected in VALID_TIME_CASES:
+            with self.subTest(time_str=time_str):
+                self.assertEqual(parse_time(time_str), expected)
+
+    def test_invalid_times_raise(self):
+        """Test that invalid time strings raise ValueError with a clear message."""
+        for time_str, expected_error in INVALID_TIME_CASES:
+            with self.subTest(time_str=time_str):
+                with self.assertRaises(ValueError) as context:
+                    parse_time(time_str)
+                self.assertIn(expected_error, str(context.exception))
 
 
 class TestParseCSV(unittest.TestCase):
     """Unit tests for parse_csv function."""
 
-    def _create_temp_csv(self, content: str) -> str:
-        """Create a temporary CSV file with given content."""
-        fd, path = tempfile.mkstemp(suffix=".csv")
-        with os.fdopen(fd, "w") as f:
-            f.write(content)
-        return path
-
     def test_valid_csv_parsing(self):
         """Test parsing a valid CSV file."""
         csv_content = """CustomerName,AverageCallDurationSeconds,StartTimePT,EndTimePT,NumberOfCalls,Priority
 Stanford Hospital,300,9AM,7PM,20000,1
 VNS,120,6AM,1PM,40500,2"""
 
-        path = self._create_temp_csv(csv_content)
-        try:
-            records = parse_csv(path)
-            self.assertEqual(len(records), 2)
-
-            # Check first record
-            self.assertEqual(records[0].name, "Stanford Hospital")
-            self.assertEqual(records[0].avg_duration_seconds, 300)
-            self.assertEqual(records[0].start_hour, 9)
-            self.assertEqual(records[0].end_hour, 19)
-            self.assertEqual(records[0].num_calls, 20000)
-            self.assertEqual(records[0].priority, 1)
-
-            # Check second record
-            self.assertEqual(records[1].name, "VNS")
-            self.assertEqual(records[1].avg_duration_seconds, 120)
-            self.assertEqual(records[1].start_hour, 6)
-            self.assertEqual(records[1].end_hour, 13)
-            self.assertEqual(records[1].num_calls, 40500)
-            self.assertEqual(records[1].priority, 2)
-        finally:
-            os.unlink(path)
+        csv_file = io.StringIO(csv_content)
+        records = parse_csv(csv_file)
+        self.assertEqual(len(records), 2)
+
+        # Check first record
+        self.assertEqual(records[0].name, "Stanford Hospital")
+        self.assertEqual(records[0].avg_duration_seconds, 300)
+        self.assertEqual(records[0].start_hour, 9)
+        self.assertEqual(records[0].end_hour, 19)
+        self.assertEqual(records[0].num_calls, 20000)
+        self.assertEqual(records[0].priority, 1)
+
+        # Check second record
+        self.assertEqual(records[1].name, "VNS")
+        self.assertEqual(records[1].avg_duration_seconds, 120)
+        self.assertEqual(records[1].start_hour, 6)
+        self.assertEqual(records[1].end_hour, 13)
+        self.assertEqual(records[1].num_calls, 40500)
+        self.assertEqual(records[1].priority, 2)
 
     def test_whitespace_in_values(self):
         """Test that whitespace in values is handled."""
         csv_content = """CustomerName,AverageCallDurationSeconds,StartTimePT,EndTimePT,NumberOfCalls,Priority
   Stanford Hospital  , 300 , 9AM , 7PM , 20000 , 1 """
 
-        path = self._create_temp_csv(csv_content)
-        try:
-            records = parse_csv(path)
-            self.assertEqual(len(records), 1)
-            self.assertEqual(records[0].name, "Stanford Hospital")
-            self.assertEqual(records[0].avg_duration_seconds, 300)
-        finally:
-            os.unlink(path)
+        csv_file = io.StringIO(csv_content)
+        records = parse_csv(csv_file)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].name, "Stanford Hospital")
+        self.assertEqual(records[0].avg_duration_seconds, 300)
 
     def test_12am_12pm_in_csv(self):
         """Test 12AM and 12PM edge cases in CSV."""
@@ -143,164 +122,134 @@ VNS,120,6AM,1PM,40500,2"""
 Midnight Shift,300,12AM,6AM,1000,1
 Noon Shift,300,12PM,6PM,1000,2"""
 
-        path = self._create_temp_csv(csv_content)
-        try:
-            records = parse_csv(path)
-            self.assertEqual(len(records), 2)
+        csv_file = io.StringIO(csv_content)
+        records = parse_csv(csv_file)
+        self.assertEqual(len(records), 2)
 
-            # 12AM = 0, 6AM = 6
-            self.assertEqual(records[0].start_hour, 0)
-            self.assertEqual(records[0].end_hour, 6)
+        # 12AM = 0, 6AM = 6
+        self.assertEqual(records[0].start_hour, 0)
+        self.assertEqual(records[0].end_hour, 6)
 
-            # 12PM = 12, 6PM = 18
-            self.assertEqual(records[1].start_hour, 12)
-            self.assertEqual(records[1].end_hour, 18)
-        finally:
-            os.unlink(path)
+        # 12PM = 12, 6PM = 18
+        self.assertEqual(records[1].start_hour, 12)
+        self.assertEqual(records[1].end_hour, 18)
 
-
-class TestParseCSVEdgeCases(unittest.TestCase):
-    """Edge case tests for parse_csv function."""
-
-    def _create_temp_csv(self, content: str) -> str:
-        """Create a temporary CSV file with given content."""
+    def test_parse_from_file_path(self):
+        """Test parsing a CSV file given as a str or os.PathLike path."""
         fd, path = tempfile.mkstemp(suffix=".csv")
-        with os.fdopen(fd, "w") as f:
-            f.write(content)
-        return path
-
-    def test_end_before_start_exits(self):
-        """Test that end time before start time causes exit."""
-        csv_content = """CustomerName,AverageCallDurationSeconds,StartTimePT,EndTimePT,NumberOfCalls,Priority
-Bad Customer,300,7PM,9AM,1000,1"""
-
-        path = self._create_temp_csv(csv_content)
-        try:
-            with self.assertRaises(SystemExit):
-                parse_csv(path)
-        finally:
-            os.unlink(path)
-
-    def test_end_equals_start_exits(self):
-        """Test that end time equal to start time causes exit."""
-        csv_content = """CustomerName,AverageCallDurationSeconds,StartTimePT,EndTimePT,NumberOfCalls,Priority
-Bad Customer,300,9AM,9AM,1000,1"""
-
-        path = self._create_temp_csv(csv_content)
-        try:
-            with self.assertRaises(SystemExit):
-                parse_csv(path)
-        finally:
-            os.unlink(path)
-
-    def test_invalid_priority_too_low_exits(self):
-        """Test that priority < 1 causes exit."""
-        csv_content = """CustomerName,AverageCallDurationSeconds,StartTimePT,EndTimePT,NumberOfCalls,Priority
-Bad Customer,300,9AM,5PM,1000,0"""
-
-        path = self._create_temp_csv(csv_content)
+        with os.fdopen(fd, "w", newline="") as f:
+            f.write(f"{CSV_HEADER}\nStanford Hospital,300,9AM,7PM,20000,1\n")
         try:
-            with self.assertRaises(SystemExit):
-                parse_csv(path)
+            for source in (path, Path(path)):
+                with self.subTest(source_type=type(source).__name__):
+                    records = parse_csv(source)
+                    self.assertEqual(len(records), 1)
+                    self.assertEqual(records[0].name, "Stanford Hospital")
+                    self.assertEqual(records[0].start_hour, 9)
+                    self.assertEqual(records[0].end_hour, 19)
         finally:
             os.unlink(path)
 
-    def test_invalid_priority_too_high_exits(self):
-        """Test that priority > 5 causes exit."""
-        csv_content = """CustomerName,AverageCallDurationSeconds,StartTimePT,EndTimePT,NumberOfCalls,Priority
-Bad Customer,300,9AM,5PM,1000,6"""
 
-        path = self._create_temp_csv(csv_content)
-        try:
-            with self.assertRaises(SystemExit):
-                parse_csv(path)
-        finally:
-            os.unlink(path)
+# Each case: (description, CSV content, expected fragment of the error message)
+INVALID_CSV_CASES = [
+    (
+        "end time before start time",
+        f"{CSV_HEADER}\nBad Customer,300,7PM,9AM,1000,1",
+        "must be after",
+    ),
+    (
+        "end time equal to start time",
+        f"{CSV_HEADER}\nBad Customer,300,9AM,9AM,1000,1",
+        "must be after",
+    ),
+    (
+        "priority < 1",
+        f"{CSV_HEADER}\nBad Customer,300,9AM,5PM,1000,0",
+        "Priority must be 1-5",
+    ),
+    (
+        "priority > 5",
+        f"{CSV_HEADER}\nBad Customer,300,9AM,5PM,1000,6",
+        "Priority must be 1-5",
+    ),
+    (
+        "negative number of calls",
+        f"{CSV_HEADER}\nBad Customer,300,9AM,5PM,-100,1",
+        "NumberOfCalls cannot be negative",
+    ),
+    (
+        "zero duration",
+        f"{CSV_HEADER}\nBad Customer,0,9AM,5PM,1000,1",
+        "AverageCallDurationSeconds must be positive",
+    ),
+    (
+        "negative duration",
+        f"{CSV_HEADER}\nBad Customer,-100,9AM,5PM,1000,1",
+        "AverageCallDurationSeconds must be positive",
+    ),
+    (
+        "empty customer name",
+        f"{CSV_HEADER}\n,300,9AM,5PM,1000,1",
+        "CustomerName is required",
+    ),
+    (
+        "missing column value in row",
+        f"{CSV_HEADER}\nStanford Hospital,300,9AM,7PM,20000",
+        "missing value(s) for column(s): Priority",
+    ),
+    (
+        "missing header column",
+        "CustomerName,AverageCallDurationSeconds,StartTimePT,EndTimePT,NumberOfCalls\n"
+        "Stanford Hospital,300,9AM,7PM,20000",
+        "missing required column(s): Priority",
+    ),
+    (
+        "extra trailing value in row",
+        f"{CSV_HEADER}\nStanford Hospital,300,9AM,7PM,20000,1,extra",
+        "Error parsing row 2: Row 2 has more columns than expected. Extra value(s): ['extra']",
+    ),
+    (
+        # Blank lines are skipped and do not advance the reported row number
+        "blank line before bad row",
+        f"{CSV_HEADER}\nGood Customer,300,9AM,5PM,1000,1\n\nBad Customer,300,9AM,5PM,1000,6",
+        "Error parsing row 3: Priority must be 1-5, got: 6",
+    ),
+    (
+        # A duplicated header column resolves to its last occurrence
+        "duplicated header column uses last occurrence",
+        f"{CSV_HEADER},Priority\nStanford Hospital,300,9AM,7PM,20000,1,6",
+        "Error parsing row 2: Priority must be 1-5, got: 6",
+    ),
+    (
+        "duplicate customer name",
+        f"{CSV_HEADER}\nA,3600,9AM,11AM,20,1\nA,3600,10AM,12PM,40,2",
+        "Error parsing row 3: Duplicate CustomerName 'A' (first seen in row 2)",
+    ),
+]
 
-    def test_negative_calls_exits(self):
-        """Test that negative number of calls causes exit."""
-        csv_content = """CustomerName,AverageCallDurationSeconds,StartTimePT,EndTimePT,NumberOfCalls,Priority
-Bad Customer,300,9AM,5PM,-100,1"""
 
-        path = self._create_temp_csv(csv_content)
-        try:
-            with self.assertRaises(SystemExit):
-                parse_csv(path)
-        finally:
-            os.unlink(path)
-
-    def test_zero_duration_exits(self):
-        """Test that zero duration causes exit."""
-        csv_content = """CustomerName,AverageCallDurationSeconds,StartTimePT,EndTimePT,NumberOfCalls,Priority
-Bad Customer,0,9AM,5PM,1000,1"""
-
-        path = self._create_temp_csv(csv_content)
-        try:
-            with self.assertRaises(SystemExit):
-                parse_csv(path)
-        finally:
-            os.unlink(path)
-
-    def test_negative_duration_exits(self):
-        """Test that negative duration causes exit."""
-        csv_content = """CustomerName,AverageCallDurationSeconds,StartTimePT,EndTimePT,NumberOfCalls,Priority
-Bad Customer,-100,9AM,5PM,1000,1"""
-
-        path = self._create_temp_csv(csv_content)
-        try:
-            with self.assertRaises(SystemExit):
-                parse_csv(path)
-        finally:
-            os.unlink(path)
-
-    def test_empty_customer_name_exits(self):
-        """Test that empty customer name causes exit."""
-        csv_content = """CustomerName,AverageCallDurationSeconds,StartTimePT,EndTimePT,NumberOfCalls,Priority
-,300,9AM,5PM,1000,1"""
-
-        path = self._create_temp_csv(csv_content)
-        try:
-            with self.assertRaises(SystemExit):
-                parse_csv(path)
-        finally:
-            os.unlink(path)
-
-    def test_missing_column_in_row_exits(self):
-        """Test that missing column value causes exit."""
-        csv_content = """CustomerName,AverageCallDurationSeconds,StartTimePT,EndTimePT,NumberOfCalls,Priority
-Stanford Hospital,300,9AM,7PM,20000"""
-
-        path = self._create_temp_csv(csv_content)
-        try:
-            with self.assertRaises(SystemExit):
-                parse_csv(path)
-        finally:
-            os.unlink(path)
+class TestParseCSVEdgeCases(unittest.TestCase):
+    """Edge case tests for parse_csv function."""
 
-    def test_missing_header_column_exits(self):
-        """Test that missing header column causes exit."""
-        csv_content = """CustomerName,AverageCallDurationSeconds,StartTimePT,EndTimePT,NumberOfCalls
-Stanford Hospital,300,9AM,7PM,20000"""
-
-        path = self._create_temp_csv(csv_content)
-        try:
-            with self.assertRaises(SystemExit):
-                parse_csv(path)
-        finally:
-            os.unlink(path)
+    def test_invalid_input_exits(self):
+        """Test that each invalid input exits with a descriptive error."""
+        for description, csv_content, expected_error in INVALID_CSV_CASES:
+            with self.subTest(description):
+                stderr = io.StringIO()
+                with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit):
+                    parse_csv(io.StringIO(csv_content))
+                self.assertIn(expected_error, stderr.getvalue())
 
     def test_zero_calls_allowed(self):
         """Test that zero calls is allowed (edge case)."""
         csv_content = """CustomerName,AverageCallDurationSeconds,StartTimePT,EndTimePT,NumberOfCalls,Priority
 No Calls Customer,300,9AM,5PM,0,1"""
 
-        path = self._create_temp_csv(csv_content)
-        try:
-            records = parse_csv(path)
-            self.assertEqual(len(records), 1)
-            self.assertEqual(records[0].num_calls, 0)
-        finally:
-            os.unlink(path)
+        csv_file = io.StringIO(csv_content)
+        records = parse_csv(csv_file)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].num_calls, 0)
 
 
 if __name__ == "__main__":
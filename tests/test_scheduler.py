@@ -2,6 +2,7 @@
 Unit tests for scheduler agent calculation.
 """
 
+import operator
 import os
 import sys
 import unittest
@@ -20,124 +21,126 @@ from scheduler import (
 )
 
 
-class TestCalculateAgentsPerHour(unittest.TestCase):
-    """Unit tests for calculate_agents_per_hour function."""
-
-    def test_basic_calculation(self):
-        """Test basic agent calculation formula."""
+# (description, record, utilization, expected agents by hour)
+AGENTS_PER_HOUR_CASES = [
+    (
         # 3600 calls over 10 hours = 360 calls/hour
         # 360 calls * 10 seconds / 3600 = 1 agent
-        record = CustomerRecord(
+        "basic calculation",
+        CustomerRecord(
             name="Test",
             avg_duration_seconds=10,
             start_hour=9,
             end_hour=19,  # 10 hours
             num_calls=3600,
             priority=1,
-        )
-        result = calculate_agents_per_hour(record, utilization=1.0)
-
-        self.assertEqual(len(result), 10)  # 10 hours
-        self.assertEqual(result[9], 1)  # 1 agent per hour
-
-    def test_ceiling_applied(self):
-        """Test that ceiling is applied to fractional agents."""
+        ),
+        1.0,
+        {hour: 1 for hour in range(9, 19)},
+    ),
+    (
         # 100 calls over 10 hours = 10 calls/hour
         # 10 calls * 100 seconds / 3600 = 0.278 agents -> ceil to 1
-        record = CustomerRecord(
+        "ceiling applied",
+        CustomerRecord(
             name="Test",
             avg_duration_seconds=100,
             start_hour=9,
             end_hour=19,
             num_calls=100,
             priority=1,
-        )
-        result = calculate_agents_per_hour(record, utilization=1.0)
-
-        self.assertEqual(result[9], 1)
-
-    def test_utilization_factor(self):
-        """Test that utilization factor affects calculation."""
+        ),
+        1.0,
+        {hour: 1 for hour in range(9, 19)},
+    ),
+    (
         # 3600 calls over 10 hours = 360 calls/hour
         # 360 * 10 / 3600 / 0.5 = 2 agents (50% utilization)
-        record = CustomerRecord(
+        "utilization factor",
+        CustomerRecord(
             name="Test",
             avg_duration_seconds=10,
             start_hour=9,
             end_hour=19,
             num_calls=3600,
             priority=1,
-        )
-        result = calculate_agents_per_hour(record, utilization=0.5)
-
-        self.assertEqual(result[9], 2)
-
-    def test_only_active_hours(self):
-        """Test that only active hours have agents."""
-        record = CustomerRecord(
+        ),
+        0.5,
+        {hour: 2 for hour in range(9, 19)},
+    ),
+    (
+        # Only hours 9-16 have entries (17 is exclusive)
+        # 1000/8 = 125 calls/hour, 125 * 300 / 3600 = 10.42 -> 11 agents
+        "only active hours",
+        CustomerRecord(
             name="Test",
             avg_duration_seconds=300,
             start_hour=9,
             end_hour=17,  # 9AM to 5PM
             num_calls=1000,
             priority=1,
-        )
-        result = calculate_agents_per_hour(record, utilization=1.0)
-
-        # Should only have entries for hours 9-16 (17 is exclusive)
-        self.assertIn(9, result)
-        self.assertIn(16, result)
-        self.assertNotIn(8, result)
-        self.assertNotIn(17, result)
-
-    def test_zero_active_hours(self):
-        """Test edge case where start equals end (invalid but handled)."""
-        record = CustomerRecord(
+        ),
+        1.0,
+        {hour: 11 for hour in range(9, 17)},
+    ),
+    (
+        # Start equals end (invalid but handled)
+        "zero active hours",
+        CustomerRecord(
             name="Test",
             avg_duration_seconds=300,
             start_hour=9,
             end_hour=9,  # No active hours
             num_calls=1000,
             priority=1,
-        )
-        result = calculate_agents_per_hour(record, utilization=1.0)
-
-        self.assertEqual(result, {})
-
-    def test_sample_data_stanford(self):
-        """Test with Stanford Hospital sample data."""
+        ),
+        1.0,
+        {},
+    ),
+    (
         # Stanford: 300s duration, 9AM-7PM (10 hours), 20000 calls
         # 20000/10 = 2000 calls/hour
         # 2000 * 300 / 3600 = 166.67 -> 167 agents
-        record = CustomerRecord(
+        "sample data stanford",
+        CustomerRecord(
             name="Stanford Hospital",
             avg_duration_seconds=300,
             start_hour=9,
             end_hour=19,
             num_calls=20000,
             priority=1,
-        )
-        result = calculate_agents_per_hour(record, utilization=1.0)
-
-        self.assertEqual(result[9], 167)
-        self.assertEqual(result[18], 167)
-
-    def test_sample_data_vns(self):
-        """Test with VNS sample data."""
+        ),
+        1.0,
+        {hour: 167 for hour in range(9, 19)},
+    ),
+    (
         # VNS: 120s duration, 6AM-1PM (7 hours), 40500 calls
         # 40500/7 = 5785.7 calls/hour
         # 5785.7 * 120 / 3600 = 192.86 -> 193 agents
-        record = CustomerRecord(
+        "sample data vns",
+        CustomerRecord(
             name="VNS",
             avg_duration_seconds=120,
             start_hour=6,
             end_hour=13,
             num_calls=40500,
             priority=1,
-        )
-        result = calculate_agents_per_hour(record, utilization=1.0)
+        ),
+        1.0,
+        {hour: 193 for hour in range(6, 13)},
+    ),
+]
 
-        self.assertEqual(result[6], 193)
+
+class TestCalculateAgentsPerHour(unittest.TestCase):
+    """Unit tests for calculate_agents_per_hour function."""
+
+    def test_calculation(self):
+        """Test the agent formula, ceiling, utilization and active-hour window."""
+        for description, record, utilization, expected in AGENTS_PER_HOUR_CASES:
+            with self.subTest(description):
+                result = calculate_agents_per_hour(record, utilization=utilization)
+                self.assertEqual(result, expected)
 
 
 class TestScheduleUnconstrained(unittest.TestCase):
@@ -204,40 +207,61 @@ class TestScheduleUnconstrained(unittest.TestCase):
         self.assertEqual(allocations[12].total_agents, 10)
         self.assertEqual(allocations[12].customer_agents, {"B": 10})
 
-    def test_exactly_24_allocations(self):
-        """Test that exactly 24 allocations are returned."""
+    def test_duplicate_names_total_matches_breakdown(self):
+        """Test that records sharing a name never inflate total_agents."""
+        # parse_csv rejects duplicate names, but direct callers can still pass them
         records = [
             CustomerRecord(
-                name="Test",
-                avg_duration_seconds=300,
+                name="A",
+                avg_duration_seconds=3600,
                 start_hour=9,
-                end_hour=17,
-                num_calls=1000,
+                end_hour=11,
+                num_calls=20,  # 10 agents/hour
                 priority=1,
-            )
+            ),
+            CustomerRecord(
+                name="A",
+                avg_duration_seconds=3600,
+                start_hour=10,
+                end_hour=12,
+                num_calls=40,  # 20 agents/hour
+                priority=2,
+            ),
         ]
         allocations = schedule_unconstrained(records, utilization=1.0)
 
-        self.assertEqual(len(allocations), 24)
-        for i, alloc in enumerate(allocations):
-            self.assertEqual(alloc.hour, i)
+        for alloc in allocations:
+            with self.subTest(hour=alloc.hour):
+                self.assertEqual(
+                    alloc.total_agents, sum(alloc.customer_agents.values())
+                )
+
+    def test_exactly_24_allocations(self):
+        """Test that exactly 24 allocations are returned, one per hour in order."""
+        # The 24-slot shape is part of the return contract, independent of input
+        allocations = schedule_unconstrained([], utilization=1.0)
+
+        self.assertEqual([alloc.hour for alloc in allocations], list(range(24)))
 
 
 class TestScheduleWithCapacity(unittest.TestCase):
     """Tests for schedule_with_capacity function."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build the record shared by the single-customer tests."""
+        cls.hundred_per_hour = CustomerRecord(
+            name="Test",
+            avg_duration_seconds=3600,
+            start_hour=9,
+            end_hour=17,
+            num_calls=800,  # 100 calls/hour = 100 agents
+            priority=1,
+        )
+
     def test_capacity_not_exceeded(self):
         """Test that capacity is never exceeded."""
-        records = [
-            CustomerRecord(
-                name="Big",
-                avg_duration_seconds=3600,
-                start_hour=9,
-                end_hour=17,
-                num_calls=800,  # 100 calls/hour = 100 agents
-                priority=1,
-            ),
-        ]
+        records = [self.hundred_per_hour]
         allocations = schedule_with_capacity(records, utilization=1.0, capacity=50)
 
         for alloc in allocations:
@@ -270,62 +294,75 @@ class TestScheduleWithCapacity(unittest.TestCase):
         self.assertEqual(allocations[9].customer_agents.get("High Priority"), 100)
         self.assertEqual(allocations[9].customer_agents.get("Low Priority"), 50)
 
-    def test_unmet_demand_tracked(self):
-        """Test that unmet demand is correctly tracked."""
+    def test_duplicate_names_total_matches_breakdown(self):
+        """Test that records sharing a name never inflate total_agents."""
         records = [
             CustomerRecord(
-                name="Test",
+                name="A",
                 avg_duration_seconds=3600,
                 start_hour=9,
-                end_hour=17,
-                num_calls=800,  # 100 agents/hour
+                end_hour=11,
+                num_calls=20,  # 10 agents/hour
                 priority=1,
             ),
+            CustomerRecord(
+                name="A",
+                avg_duration_seconds=3600,
+                start_hour=10,
+                end_hour=12,
+                num_calls=40,  # 20 agents/hour
+                priority=2,
+            ),
         ]
+        allocations = schedule_with_capacity(records, utilization=1.0, capacity=25)
+
+        for alloc in allocations:
+            with self.subTest(hour=alloc.hour):
+                self.assertEqual(
+                    alloc.total_agents, sum(alloc.customer_agents.values())
+                )
+
+    def test_unmet_demand_tracked(self):
+        """Test that unmet demand is correctly tracked."""
+        records = [self.hundred_per_hour]
         allocations = schedule_with_capacity(records, utilization=1.0, capacity=60)
 
         # Should have 60 allocated, 40 unmet
         self.assertEqual(allocations[9].customer_agents.get("Test"), 60)
         self.assertEqual(allocations[9].unmet_demand.get("Test"), 40)
+        self.assertEqual(allocations[9].unmet_total, 40)
 
 
 class TestScheduleWithCapacityShift(unittest.TestCase):
     """Tests for schedule_with_capacity_shift function."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build the record shared by the overflow tests."""
+        cls.overloaded = CustomerRecord(
+            name="Test",
+            avg_duration_seconds=3600,
+            start_hour=9,
+            end_hour=13,  # 4 hours
+            num_calls=400,  # 100 agents/hour normally
+            priority=1,
+        )
+
     def test_redistribution_reduces_overflow(self):
         """Test that redistribution helps reduce overflow."""
-        records = [
-            CustomerRecord(
-                name="Test",
-                avg_duration_seconds=3600,
-                start_hour=9,
-                end_hour=13,  # 4 hours
-                num_calls=400,  # 100 agents/hour normally
-                priority=1,
-            ),
-        ]
+        records = [self.overloaded]
         # With capacity 80, should redistribute to spread load
         allocations, redistributions = schedule_with_capacity_shift(
             records, utilization=1.0, capacity=80
         )
 
         # All hours should be at or below capacity after redistribution
-        for alloc in allocations:
-            if alloc.total_agents > 0:
-                self.assertLessEqual(alloc.total_agents, 80)
+        peak_agents = max(alloc.total_agents for alloc in allocations)
+        self.assertLessEqual(peak_agents, 80)
 
     def test_redistribution_summary_returned(self):
         """Test that redistribution summary is returned."""
-        records = [
-            CustomerRecord(
-                name="Test",
-                avg_duration_seconds=3600,
-                start_hour=9,
-                end_hour=13,
-                num_calls=400,  # 100 agents/hour - exceeds capacity
-                priority=1,
-            ),
-        ]
+        records = [self.overloaded]
         allocations, redistributions = schedule_with_capacity_shift(
             records, utilization=1.0, capacity=80
         )
@@ -351,6 +388,36 @@ class TestScheduleWithCapacityShift(unittest.TestCase):
 
         self.assertEqual(len(redistributions), 0)
 
+    def test_duplicate_names_total_matches_breakdown(self):
+        """Test that records sharing a name never inflate total_agents."""
+        records = [
+            CustomerRecord(
+                name="A",
+                avg_duration_seconds=3600,
+                start_hour=9,
+                end_hour=11,
+                num_calls=20,  # 10 agents/hour
+                priority=1,
+            ),
+            CustomerRecord(
+                name="A",
+                avg_duration_seconds=3600,
+                start_hour=10,
+                end_hour=12,
+                num_calls=40,  # 20 agents/hour
+                priority=2,
+            ),
+        ]
+        allocations, _ = schedule_with_capacity_shift(
+            records, utilization=1.0, capacity=25
+        )
+
+        for alloc in allocations:
+            with self.subTest(hour=alloc.hour):
+                self.assertEqual(
+                    alloc.total_agents, sum(alloc.customer_agents.values())
+                )
+
     def test_redistribution_preserves_high_priority_even_distribution(self):
         """
         Test that redistribution creates uneven distribution for low priority
@@ -391,56 +458,50 @@ class TestScheduleWithCapacityShift(unittest.TestCase):
             records, utilization=1.0, capacity=100
         )
 
+        # Per-hour agents for each customer across the shared window 9-12
+        high_priority_by_hour = [
+            alloc.customer_agents.get("HighPriority", 0) for alloc in allocations[9:13]
+        ]
+        low_priority_by_hour = [
+            alloc.customer_agents.get("LowPriority", 0) for alloc in allocations[9:13]
+        ]
+
         # Verify high priority has EVEN distribution (50 each hour it's active)
-        for hour in range(9, 11):
-            alloc = allocations[hour]
-            high_priority_agents = alloc.customer_agents.get("HighPriority", 0)
-            low_priority_agents = alloc.customer_agents.get("LowPriority", 0)
-            self.assertEqual(
-                high_priority_agents,
-                50,
-                f"Hour {hour}: High priority should have exactly 50 agents (even distribution)",
-            )
-            self.assertEqual(
-                low_priority_agents,
-                50,
-                f"Hour {hour}: Low priority should have exactly 50 agents",
-            )
-        alloc_11 = allocations[11]
-        low_priority_agents_11 = alloc_11.customer_agents.get("LowPriority", 0)
         self.assertEqual(
-            low_priority_agents_11,
+            high_priority_by_hour[:2],
+            [50, 50],
+            "Hours 9-10: High priority should have exactly 50 agents (even distribution)",
+        )
+        self.assertEqual(
+            low_priority_by_hour[:2],
+            [50, 50],
+            "Hours 9-10: Low priority should have exactly 50 agents",
+        )
+        self.assertEqual(
+            low_priority_by_hour[2],
             80,
-            f"Hour 11 Low priority should have exactly 80 agents",
+            "Hour 11 Low priority should have exactly 80 agents",
         )
 
-        # Verify low priority has UNEVEN distribution due to redistribution
-        low_priority_by_hour = []
-        for hour in range(9, 13):
-            alloc = allocations[hour]
-            low_priority_agents = alloc.customer_agents.get("LowPriority", 0)
-            low_priority_by_hour.append(low_priority_agents)
-
-        # Low priority should have less agents in hours 9-10 (overflow hours)
-        # and more in hours 11-12 (non-overlap hours)
+        # Verify low priority has UNEVEN distribution due to redistribution:
+        # less agents in hours 9-10 (overflow hours) and more in hours 11-12
+        # (non-overlap hours)
         overlap_hours_avg = (low_priority_by_hour[0] + low_priority_by_hour[1]) / 2
         non_overlap_hours_avg = (low_priority_by_hour[2] + low_priority_by_hour[3]) / 2
 
         self.assertLess(
             overlap_hours_avg,
             non_overlap_hours_avg,
-            f"Low priority should have fewer agents in overlap hours (9-10): "
-            f"overlap avg={overlap_hours_avg}, non-overlap avg={non_overlap_hours_avg}",
+            "Low priority should have fewer agents in overlap hours (9-10)",
         )
 
         # Verify capacity is not exceeded in any hour
-        for hour in range(9, 13):
-            alloc = allocations[hour]
-            self.assertLessEqual(
-                alloc.total_agents,
-                100,
-                f"Hour {hour}: Total agents {alloc.total_agents} exceeds capacity 100",
-            )
+        totals = [alloc.total_agents for alloc in allocations[9:13]]
+        self.assertLessEqual(
+            max(totals),
+            100,
+            f"Total agents per hour 9-12 {totals} exceed capacity 100",
+        )
 
         # Verify redistributions occurred
         self.assertGreater(
@@ -454,7 +515,7 @@ class TestScheduleWithCapacityShift(unittest.TestCase):
             self.assertEqual(
                 redist.customer,
                 "LowPriority",
-                f"Only LowPriority should be redistributed, got: {redist.customer}",
+                "Only LowPriority should be redistributed",
             )
 
     def test_redistribution_maximizes_served_calls(self):
@@ -471,50 +532,44 @@ class TestScheduleWithCapacityShift(unittest.TestCase):
         Expected: All 320 agent-hours should be utilized (no unmet demand
         if calls can be redistributed within the window).
         """
-        records = [
-            CustomerRecord(
-                name="Test",
-                avg_duration_seconds=3600,
-                start_hour=9,
-                end_hour=13,  # 4 hours
-                num_calls=400,  # 100 agents/hour normally
-                priority=1,
-            ),
-        ]
+        records = [self.overloaded]
 
         allocations, redistributions = schedule_with_capacity_shift(
             records, utilization=1.0, capacity=80
         )
 
         # Calculate total agents allocated
-        total_allocated = sum(alloc.total_agents for alloc in allocations)
+        total_allocated = sum(map(operator.attrgetter("total_agents"), allocations))
 
         # Should maximize usage - all 320 agent-hours should be used
         # (80 capacity * 4 hours = 320)
         self.assertEqual(
             total_allocated,
             320,
-            f"Should utilize full capacity: expected 320, got {total_allocated}",
+            "Should utilize full capacity",
         )
 
         # Each hour should be at capacity
-        for hour in range(9, 13):
-            self.assertEqual(
-                allocations[hour].total_agents,
-                80,
-                f"Hour {hour} should be at capacity (80)",
-            )
+        self.assertEqual(
+            [alloc.total_agents for alloc in allocations[9:13]],
+            [80] * 4,
+            "Hours 9-12 should be at capacity (80)",
+        )
 
-        # Should have unmet demand since 400 > 320
+        # Should have unmet demand since 400 > 320, both per customer and in
+        # the per-hour totals
         total_unmet = sum(
-            sum(alloc.unmet_demand.values())
-            for alloc in allocations
-            if alloc.unmet_demand
+            sum(alloc.unmet_demand.values()) for alloc in allocations
         )
         self.assertEqual(
             total_unmet,
             80,
-            f"Should have 80 agent-hours unmet (400 - 320), got {total_unmet}",
+            "Should have 80 agent-hours unmet (400 - 320)",
+        )
+        self.assertEqual(
+            sum(map(operator.attrgetter("unmet_total"), allocations)),
+            80,
+            "Per-hour unmet_total should add up to 80 agent-hours",
         )
 
 
@@ -578,10 +633,8 @@ class TestAgentCalculationEdgeCases(unittest.TestCase):
         )
         result = calculate_agents_per_hour(record, utilization=1.0)
 
-        self.assertEqual(len(result), 24)
-        # 1000 * 300 / 3600 = 83.33 -> 84
-        for hour in range(24):
-            self.assertEqual(result[hour], 84)
+        # 1000 * 300 / 3600 = 83.33 -> 84 agents in every hour
+        self.assertEqual(result, dict.fromkeys(range(24), 84))
 
 
 if __name__ == "__main__":